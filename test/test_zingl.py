@@ -85,3 +85,42 @@ class TestZingl(unittest.TestCase):
             x, y = random.randint(0, 100), random.randint(0, 100)
             for plot in plot_line(x, y, random.randint(0, 100), random.randint(0, 100)):
                 pass
+
+    def test_subpixel_quad_bezier(self):
+        for x, y in plot_quad_bezier(0, 0, 12800, 12800, 25600, 25600, subpixel=256):
+            self.assertEqual(x, y)
+        self.assertEqual(
+            list(plot_quad_bezier(0, 0, 2304, 1024, 0, 2560, subpixel=256)),
+            list(plot_quad_bezier(0, 0, 9, 4, 0, 10)),
+        )
+        plots = list(plot_quad_bezier(383, -129, 2000, 3000, 25727, 640, subpixel=256))
+        self.assertEqual(plots[0], (1, -1))
+        self.assertEqual(plots[-1], (100, 3))
+
+    def test_subpixel_cubic_bezier(self):
+        for x, y in plot_cubic_bezier(
+            0, 0, 12800, 12800, 25600, 25600, 38400, 38400, subpixel=256
+        ):
+            self.assertEqual(x, y)
+        for x, y in plot_cubic_bezier(0, 0, 100, 100, 100, 100, 0, 0, subpixel=1):
+            self.assertEqual(x, y)
+        plots = list(
+            plot_cubic_bezier(383, -129, 2000, 3000, 9000, -4000, 25727, 640, subpixel=256)
+        )
+        self.assertEqual(plots[0], (1, -1))
+        self.assertEqual(plots[-1], (100, 3))
+
+    def test_random_subpixel(self):
+        import random
+
+        for i in range(1000):
+            coords = [random.randint(-25600, 25600) for _ in range(8)]
+            for plots in (
+                list(plot_quad_bezier(*coords[:6], subpixel=256)),
+                list(plot_cubic_bezier(*coords, subpixel=256)),
+            ):
+                for p, q in zip(plots, plots[1:]):
+                    self.assertIsInstance(q[0], int)
+                    self.assertIsInstance(q[1], int)
+                    self.assertLessEqual(abs(p[0] - q[0]), 1)
+                    self.assertLessEqual(abs(p[1] - q[1]), 1)
@@ -5,7 +5,22 @@ The Zingl-Bresenham plotting algorithms are from Alois Zingl's "The Beauty of Br
 In the case of Zingl's work this isn't explicit from his website, however from personal
 correspondence "'Free and open source' means you can do anything with it like the MIT licence."
 """
-from math import floor, sqrt
+from math import floor, isqrt, sqrt
+
+
+def _div_round(n, d):
+    """Integer division of n by d, rounding half up. floor(n / d + 0.5) without floats."""
+    if d < 0:
+        n = -n
+        d = -d
+    return (2 * n + d) // (2 * d)
+
+
+def _clamp(v, a, b):
+    """Clamp v to the closed range between a and b, in either order."""
+    if a > b:
+        a, b = b, a
+    return min(max(v, a), b)
 
 
 def plot_line(x0, y0, x1, y1):
@@ -45,12 +60,17 @@ def plot_line(x0, y0, x1, y1):
             y0 += sy
 
 
-def plot_quad_bezier_seg(x0, y0, x1, y1, x2, y2):
+def plot_quad_bezier_seg(x0, y0, x1, y1, x2, y2, subpixel=None):
     """plot a limited quadratic Bezier segment
 
     This algorithm can plot curves that do not inflect.
 
-    It is used as part of the general algorithm, which breaks at the infection point."""
+    It is used as part of the general algorithm, which breaks at the infection point.
+
+    If subpixel is given, all coordinates are integers in 1/subpixel pixel units, the end
+    points must lie on whole pixels and the control point keeps its subpixel placement.
+    Pixels are still stepped one at a time and are yielded in whole pixel units."""
+    step = 1 if subpixel is None else subpixel
     sx = x2 - x1
     sy = y2 - y1
     xx = x0 - x1
@@ -84,24 +104,24 @@ def plot_quad_bezier_seg(x0, y0, x1, y1, x2, y2):
         else:
             sy = -1
         yy *= sy  # /* y step direction */
-        xy = 2 * xx * yy
-        xx *= xx
-        yy *= yy  # /* differences 2nd degree */
+        xy = 2 * xx * yy * step
+        xx *= xx * step
+        yy *= yy * step  # /* differences 2nd degree, scaled to the pixel step */
         if cur * sx * sy < 0:  # /* negated curvature? */
             xx = -xx
             yy = -yy
             xy = -xy
             cur = -cur
-        dx = 4.0 * sy * cur * (x1 - x0) + xx - xy  # /* differences 1st degree */
-        dy = 4.0 * sx * cur * (y0 - y1) + yy - xy
+        dx = 4 * sy * cur * (x1 - x0) + xx - xy  # /* differences 1st degree */
+        dy = 4 * sx * cur * (y0 - y1) + yy - xy
         xx += xx
         yy += yy
         err = dx + dy + xy  # /* error 1st step */
         while True:
             if points is None:
-                yield int(x0), int(y0)  # /* plot curve */
+                yield int(x0) // step, int(y0) // step  # /* plot curve */
             else:
-                points.append((int(x0), int(y0)))
+                points.append((int(x0) // step, int(y0) // step))
             if x0 == x2 and y0 == y2:
                 if points is not None:
                     for plot in reversed(points):
@@ -109,20 +129,21 @@ def plot_quad_bezier_seg(x0, y0, x1, y1, x2, y2):
                 return  # /* last pixel -> curve finished */
             y1 = 2 * err < dx  # /* save value for test of y step */
             if 2 * err > dy:
-                x0 += sx
+                x0 += sx * step
                 dx -= xy
                 dy += yy
                 err += dy
                 # /* x step */
             if y1 != 0:
-                y0 += sy
+                y0 += sy * step
                 dy -= xy
                 dx += xx
                 err += dx
                 # /* y step */
             if not (dy < 0 < dx):  # /* gradient negates -> algorithm fails */
                 break
-    for plot in plot_line(x0, y0, x2, y2):  # /* plot remaining part to end */:
+    # /* plot remaining part to end */
+    for plot in plot_line(int(x0) // step, int(y0) // step, int(x2) // step, int(y2) // step):
         if points is None:
             yield plot  # /* plot curve */
         else:
@@ -134,11 +155,17 @@ def plot_quad_bezier_seg(x0, y0, x1, y1, x2, y2):
             yield plot
 
 
-def plot_quad_bezier(x0, y0, x1, y1, x2, y2):
+def plot_quad_bezier(x0, y0, x1, y1, x2, y2, subpixel=None):
     """Zingl-Bresenham quad bezier draw algorithm.
 
-    plot any quadratic Bezier curve"""
+    plot any quadratic Bezier curve
 
+    If subpixel is given, the coordinates are fixed-point integers in 1/subpixel pixel units.
+    End points are rounded to the nearest pixel rather than truncated, control points keep
+    their subpixel placement and the curve is plotted with integer arithmetic only."""
+    if subpixel is not None:
+        yield from _plot_quad_bezier_fixed(x0, y0, x1, y1, x2, y2, subpixel)
+        return
     x0 = int(x0)
     y0 = int(y0)
     # control points are permitted fractional elements.
@@ -197,11 +224,78 @@ def plot_quad_bezier(x0, y0, x1, y1, x2, y2):
         yield from reversed(points)
 
 
-def plot_cubic_bezier_seg(x0, y0, x1, y1, x2, y2, x3, y3):
+def _plot_quad_bezier_fixed(x0, y0, x1, y1, x2, y2, step):
+    """plot any quadratic Bezier curve given in 1/step pixel units.
+
+    Same subdivision as plot_quad_bezier, with the cut points solved as exact integer ratios.
+    Cut points are rounded to whole pixels, the new control points to subpixel units."""
+    x0 = _div_round(round(x0), step) * step
+    y0 = _div_round(round(y0), step) * step
+    x1 = round(x1)
+    y1 = round(y1)
+    x2 = _div_round(round(x2), step) * step
+    y2 = _div_round(round(y2), step) * step
+    x = x0 - x1
+    y = y0 - y1
+    points = None
+
+    if x * (x2 - x1) > 0:  # /* horizontal cut at P4? */
+        t = x0 - 2 * x1 + x2
+        if y * (y2 - y1) > 0:  # /* vertical cut at P6 too? */
+            if abs((y0 - 2 * y1 + y2) * x) > abs(y * t):  # /* which first? */
+                x0 = x2
+                x2 = x + x1
+                y0 = y2
+                y2 = y + y1  # /* swap points */
+                points = list()
+                # /* now horizontal cut at P4 comes first */
+        n = x0 - x1  # /* P4 at t = n / t */
+        r = (t - n) * ((t - n) * y0 + 2 * n * y1) + n * n * y2  # /* By(t=P4) * t * t */
+        x = _div_round(x0 * x2 - x1 * x1, t * step) * step  # /* gradient dP4/dx=0 */
+        y = _div_round(r, t * t * step) * step
+        r = _clamp(y0 + _div_round((y1 - y0) * n, t), y0, y)  # /* intersect P3 | P0 P1 */
+        if points is None:
+            yield from plot_quad_bezier_seg(x0, y0, x, r, x, y, step)
+        else:
+            points.extend(plot_quad_bezier_seg(x0, y0, x, r, x, y, step))
+        r = y2 + _div_round((y1 - y2) * (x2 - x1), t)  # /* intersect P4 | P1 P2 */
+        x0 = x1 = x
+        y0 = y
+        y1 = r  # /* P0 = P4, P1 = P8 */
+    if (y0 - y1) * (y2 - y1) > 0:  # /* vertical cut at P6? */
+        t = y0 - 2 * y1 + y2
+        n = y0 - y1  # /* P6 at t = n / t */
+        r = (t - n) * ((t - n) * x0 + 2 * n * x1) + n * n * x2  # /* Bx(t=P6) * t * t */
+        x = _div_round(r, t * t * step) * step
+        y = _div_round(y0 * y2 - y1 * y1, t * step) * step  # /* gradient dP6/dy=0 */
+        r = _clamp(x0 + _div_round((x1 - x0) * n, t), x0, x)  # /* intersect P6 | P0 P1 */
+        if points is None:
+            yield from plot_quad_bezier_seg(x0, y0, r, y, x, y, step)
+        else:
+            points.extend(plot_quad_bezier_seg(x0, y0, r, y, x, y, step))
+        r = _clamp(x2 + _div_round((x1 - x2) * (y2 - y1), t), x, x2)  # /* intersect P7 | P1 P2 */
+        x0 = x
+        x1 = r
+        y0 = y1 = y  # /* P0 = P6, P1 = P7 */
+    if points is None:
+        yield from plot_quad_bezier_seg(x0, y0, x1, y1, x2, y2, step)  # /* remaining part */
+    else:
+        points.extend(plot_quad_bezier_seg(x0, y0, x1, y1, x2, y2, step))
+    if points is not None:
+        yield from reversed(points)
+
+
+def plot_cubic_bezier_seg(x0, y0, x1, y1, x2, y2, x3, y3, subpixel=None):
     """plot limited cubic Bezier segment
     This algorithm can plot curves that do not inflect.
     It is used as part of the general algorithm, which breaks at the infection point(s)
+
+    If subpixel is given, all coordinates are integers in 1/subpixel pixel units, the end
+    points must lie on whole pixels and the control points keep their subpixel placement.
+    The differences are kept 64 times larger than in Zingl's original so that integer input
+    never needs a division inside the pixel loop.
     """
+    step = 1 if subpixel is None else subpixel
     second_leg = []
     f = 0
     fx = 0
@@ -242,13 +336,16 @@ def plot_cubic_bezier_seg(x0, y0, x1, y1, x2, y2, x3, y3):
 
     if xa == 0 and ya == 0:  # /* quadratic Bezier */
         # return plot_quad_bezier_seg(x0, y0, (3 * x1 - x0) >> 1, (3 * y1 - y0) >> 1, x3, y3)
-        sx = floor((3 * x1 - x0 + 1) / 2)
-        sy = floor((3 * y1 - y0 + 1) / 2)  # /* new midpoint */
+        sx = (3 * x1 - x0 + 1) // 2
+        sy = (3 * y1 - y0 + 1) // 2  # /* new midpoint */
 
-        yield from plot_quad_bezier_seg(x0, y0, sx, sy, x3, y3)
+        yield from plot_quad_bezier_seg(x0, y0, sx, sy, x3, y3, subpixel)
         return
-    x1 = (x1 - x0) * (x1 - x0) + (y1 - y0) * (y1 - y0) + 1  # /* line lengths */
-    x2 = (x2 - x3) * (x2 - x3) + (y2 - y3) * (y2 - y3) + 1
+    # /* line lengths */
+    x1 = (x1 - x0) * (x1 - x0) + (y1 - y0) * (y1 - y0) + step * step
+    x2 = (x2 - x3) * (x2 - x3) + (y2 - y3) * (y2 - y3) + step * step
+    s1 = step  # /* step scale of 4th degree terms */
+    s2 = step * step  # /* step scale of 3rd degree terms */
 
     while True:  # /* loop over both ends */
         ab = xa * yb - xb * ya
@@ -259,40 +356,32 @@ def plot_cubic_bezier_seg(x0, y0, x1, y1, x2, y2, x3, y3):
         if ex > 0:
             f = 1  # /* calc resolution */
         else:
-            f = floor(sqrt(1 + 1024 / x1))  # /* calc resolution */
+            f = isqrt(int(1 + 1024 * step * step // x1))  # /* calc resolution */
         ab *= f
         ac *= f
         bc *= f
         ex *= f * f  # /* increase resolution */
-        xy = 9 * (ab + ac + bc) / 8
+        xy = 9 * (ab + ac + bc)  # /* 8 times */
         cb = 8 * (xa - ya)  # /* init differences of 1st degree */
         dx = 27 * (
-            8 * ab * (yb * yb - ya * yc) + ex * (ya + 2 * yb + yc)
-        ) / 64 - ya * ya * (xy - ya)
+            8 * ab * (yb * yb - ya * yc) * s1 + ex * (ya + 2 * yb + yc)
+        ) - ya * ya * (8 * xy * s1 - 64 * ya * s2)
         dy = 27 * (
-            8 * ab * (xb * xb - xa * xc) - ex * (xa + 2 * xb + xc)
-        ) / 64 - xa * xa * (xy + xa)
+            8 * ab * (xb * xb - xa * xc) * s1 - ex * (xa + 2 * xb + xc)
+        ) - xa * xa * (8 * xy * s1 + 64 * xa * s2)
         # /* init differences of 2nd degree */
-        xx = (
-            3
-            * (
-                3 * ab * (3 * yb * yb - ya * ya - 2 * ya * yc)
-                - ya * (3 * ac * (ya + yb) + ya * cb)
-            )
-            / 4
+        xx = 48 * (
+            3 * ab * (3 * yb * yb - ya * ya - 2 * ya * yc) * s1
+            - ya * (3 * ac * (ya + yb) * s1 + ya * cb * s2)
         )
-        yy = (
-            3
-            * (
-                3 * ab * (3 * xb * xb - xa * xa - 2 * xa * xc)
-                - xa * (3 * ac * (xa + xb) + xa * cb)
-            )
-            / 4
+        yy = 48 * (
+            3 * ab * (3 * xb * xb - xa * xa - 2 * xa * xc) * s1
+            - xa * (3 * ac * (xa + xb) * s1 + xa * cb * s2)
         )
-        xy = xa * ya * (6 * ab + 6 * ac - 3 * bc + cb)
+        xy = xa * ya * ((6 * ab + 6 * ac - 3 * bc) * s1 + cb * s2)
         ac = ya * ya
         cb = xa * xa
-        xy = 3 * (xy + 9 * f * (cb * yb * yc - xb * xc * ac) - 18 * xb * yb * ab) / 8
+        xy = 24 * (xy + (9 * f * (cb * yb * yc - xb * xc * ac) - 18 * xb * yb * ab) * s1)
 
         if ex < 0:  # /* negate values if inside self-intersection loop */
             dx = -dx
@@ -302,10 +391,10 @@ def plot_cubic_bezier_seg(x0, y0, x1, y1, x2, y2, x3, y3):
             xy = -xy
             ac = -ac
             cb = -cb  # /* init differences of 3rd degree */
-        ab = 6 * ya * ac
-        ac = -6 * xa * ac
-        bc = 6 * ya * cb
-        cb = -6 * xa * cb
+        ab = 384 * ya * ac * s2
+        ac = -384 * xa * ac * s2
+        bc = 384 * ya * cb * s2
+        cb = -384 * xa * cb * s2
         dx += xy
         ex = dx + dy
         dy += xy  # /* error of 1st step */
@@ -314,9 +403,9 @@ def plot_cubic_bezier_seg(x0, y0, x1, y1, x2, y2, x3, y3):
             fx = fy = f
             while x0 != x3 and y0 != y3:
                 if leg == 0:
-                    second_leg.append((x0, y0))  # /* plot curve */
+                    second_leg.append((x0 // step, y0 // step))  # /* plot curve */
                 else:
-                    yield x0, y0  # /* plot curve */
+                    yield x0 // step, y0 // step  # /* plot curve */
                 while True:  # /* move sub-steps of one pixel */
                     if pxy == 0:
                         if dx > xy or dy < xy:
@@ -346,10 +435,10 @@ def plot_cubic_bezier_seg(x0, y0, x1, y1, x2, y2, x3, y3):
                     if not (fx > 0 and fy > 0):  # /* pixel complete? */
                         break
                 if 2 * fx <= f:
-                    x0 += sx
+                    x0 += sx * step
                     fx += f  # /* x step */
                 if 2 * fy <= f:
-                    y0 += sy
+                    y0 += sy * step
                     fy += f  # /* y step */
                 if pxy == 0 and dx < 0 and dy > 0:
                     pxy = 1  # /* pixel ahead valid */
@@ -369,17 +458,24 @@ def plot_cubic_bezier_seg(x0, y0, x1, y1, x2, y2, x3, y3):
         if not (leg != 0):
             break
         leg -= 1  # /* try other end */
-    for plot in plot_line(x3, y3, x0, y0):
+    for plot in plot_line(x3 // step, y3 // step, x0 // step, y0 // step):
         # /* remaining part in case of cusp or crunode */
         second_leg.append(plot)
     for plot in reversed(second_leg):
         yield plot
 
 
-def plot_cubic_bezier(x0, y0, x1, y1, x2, y2, x3, y3):
+def plot_cubic_bezier(x0, y0, x1, y1, x2, y2, x3, y3, subpixel=None):
     """Zingl-Bresenham cubic bezier draw algorithm
 
-    plot any quadratic Bezier curve"""
+    plot any quadratic Bezier curve
+
+    If subpixel is given, the coordinates are fixed-point integers in 1/subpixel pixel units.
+    End points are rounded to the nearest pixel rather than truncated, control points keep
+    their subpixel placement and the curve is plotted with integer arithmetic only."""
+    if subpixel is not None:
+        yield from _plot_cubic_bezier_fixed(x0, y0, x1, y1, x2, y2, x3, y3, subpixel)
+        return
     x0 = int(x0)
     y0 = int(y0)
     # control points are permitted fractional elements.
@@ -486,6 +582,95 @@ def plot_cubic_bezier(x0, y0, x1, y1, x2, y2, x3, y3):
         t1 = t2
 
 
+def _plot_cubic_bezier_fixed(x0, y0, x1, y1, x2, y2, x3, y3, step):
+    """plot any cubic Bezier curve given in 1/step pixel units.
+
+    Same subdivision as plot_cubic_bezier, with the curve parameter held as a fixed-point
+    integer with 48 fractional bits. Sub-curve end points are rounded to whole pixels, their
+    control points to subpixel units."""
+    x0 = _div_round(round(x0), step) * step
+    y0 = _div_round(round(y0), step) * step
+    x1 = round(x1)
+    y1 = round(y1)
+    x2 = round(x2)
+    y2 = round(y2)
+    x3 = _div_round(round(x3), step) * step
+    y3 = _div_round(round(y3), step) * step
+    one = 1 << 48  # /* t = 1.0 */
+    one3 = one * one * one
+    xc = x0 + x1 - x2 - x3
+    xa = xc - 4 * (x1 - x2)
+    xb = x0 - x1 - x2 + x3
+    xd = xb + 4 * (x1 + x2)
+    yc = y0 + y1 - y2 - y3
+    ya = yc - 4 * (y1 - y2)
+    yb = y0 - y1 - y2 + y3
+    yd = yb + 4 * (y1 + y2)
+    t = []
+    # /* sub-divide curve at gradient sign changes */
+    for a, b, c in ((xa, xb, xc), (ya, yb, yc)):
+        if a == 0:  # /* horizontal or vertical */
+            if abs(c) < 2 * abs(b):
+                t.append(_div_round(c * one, 2 * b))  # /* one change */
+        elif b * b - a * c > 0:  # /* two changes */
+            t2 = isqrt((b * b - a * c) * one * one)
+            for t1 in (_div_round(b * one - t2, a), _div_round(b * one + t2, a)):
+                if abs(t1) < one:
+                    t.append(t1)
+    t.sort()
+    t.append(one)  # /* end point */
+    t1 = -one  # /* begin point */
+    fx0 = x0 * 8 * one3  # /* exact start of the segment, times 8 * one^3 */
+    fy0 = y0 * 8 * one3
+    for t2 in t:  # /* plot each segment separately */
+        # /* sub-divide at t1, t2, all values times 8 * one^3 */
+        fx1 = (
+            t1 * (t1 * xb - 2 * xc * one) * one
+            - t2 * (t1 * (t1 * xa - 2 * xb * one) + xc * one * one)
+            + xd * one3
+        ) - fx0
+        fy1 = (
+            t1 * (t1 * yb - 2 * yc * one) * one
+            - t2 * (t1 * (t1 * ya - 2 * yb * one) + yc * one * one)
+            + yd * one3
+        ) - fy0
+        fx2 = (
+            t2 * (t2 * xb - 2 * xc * one) * one
+            - t1 * (t2 * (t2 * xa - 2 * xb * one) + xc * one * one)
+            + xd * one3
+        ) - fx0
+        fy2 = (
+            t2 * (t2 * yb - 2 * yc * one) * one
+            - t1 * (t2 * (t2 * ya - 2 * yb * one) + yc * one * one)
+            + yd * one3
+        ) - fy0
+        fx3 = t2 * (t2 * (3 * xb * one - t2 * xa) - 3 * xc * one * one) + xd * one3
+        fy3 = t2 * (t2 * (3 * yb * one - t2 * ya) - 3 * yc * one * one) + yd * one3
+        x3 = _div_round(fx3, 8 * one3 * step) * step
+        y3 = _div_round(fy3, 8 * one3 * step) * step  # /* scale bounds */
+        if fx0 != fx3:
+            fx1 = _div_round(fx1 * (x0 - x3), fx0 - fx3)
+            fx2 = _div_round(fx2 * (x0 - x3), fx0 - fx3)
+        else:
+            fx1 = _div_round(fx1, 8 * one3)
+            fx2 = _div_round(fx2, 8 * one3)
+        if fy0 != fy3:
+            fy1 = _div_round(fy1 * (y0 - y3), fy0 - fy3)
+            fy2 = _div_round(fy2 * (y0 - y3), fy0 - fy3)
+        else:
+            fy1 = _div_round(fy1, 8 * one3)
+            fy2 = _div_round(fy2, 8 * one3)
+        if x0 != x3 or y0 != y3:  # /* segment t1 - t2 */
+            yield from plot_cubic_bezier_seg(
+                x0, y0, x0 + fx1, y0 + fy1, x0 + fx2, y0 + fy2, x3, y3, step
+            )
+        x0 = x3
+        y0 = y3
+        fx0 = fx3
+        fy0 = fy3
+        t1 = t2
+
+
 def plot_line_aa(x0, y0, x1, y1):
     dx = abs(x1 - x0)
     sx = 1 if x0 < x1 else -1